@@ -1,135 +1,503 @@
 #!/usr/bin/env python3
 
+import asyncio
+import hashlib
 import json
 import os
+import shutil
+import sqlite3
 import subprocess
-from typing import Dict, List, Optional, Tuple, Any
+import sys
+from typing import Dict, List, Literal, Optional, Tuple, Any, Union
 from dotenv import load_dotenv
 import time
+from collections import OrderedDict
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+# orjson parses large listings noticeably faster, use it when installed
+try:
+    from orjson import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+except ImportError:
+    from json import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+
+# diskcache keeps cached listings across restarts, use it when installed
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 
 load_dotenv()
 
+# Environment of the gmsaas processes, built once after loading .env
+_GMSAAS_ENV = {**os.environ, "GMSAAS_USER_AGENT_EXTRA_DATA": "mcp"}
+
+# Resolve the gmsaas executable once instead of searching PATH on every command
+_GMSAAS_BIN = shutil.which("gmsaas")
+if _GMSAAS_BIN is None:
+    print("Error: gmsaas command not found. Please ensure gmsaas is installed and in your PATH.")
+    _GMSAAS_BIN = "gmsaas"
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "genymotion-mcp")
+
+# Last token successfully configured in gmsaas, along with the state of the
+# gmsaas file storing it (see _auth_state())
+_AUTH_MARKER = os.path.join(_CACHE_DIR, "authed")
+
+def _error_output(e: subprocess.CalledProcessError) -> str:
+    """Decode the output of a failed command, only needed on the error path."""
+    return (e.stderr if e.stderr else e.stdout).decode(errors="replace")
+
+
+def _token_fingerprint(token: str) -> str:
+    """Identify an API token without storing it."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _gmsaas_auth_path() -> str:
+    """Return the path of the file where gmsaas stores its API token."""
+    config_home = os.environ.get("GMSAAS_CONFIG_HOME")
+    if not config_home:
+        if sys.platform.startswith("win32"):
+            genymobile_home = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Genymobile")
+        else:
+            genymobile_home = os.path.join(os.path.expanduser("~"), ".Genymobile")
+        config_home = os.path.join(genymobile_home, "gmsaas")
+    return os.path.join(os.path.expanduser(config_home), "auth.json")
 
+def _auth_state(token: str) -> Optional[str]:
+    """
+    Describe a configured token and the gmsaas auth file storing it.
+    
+    Any change to that file (reset, another token, wiped config) changes
+    the state, so an outdated marker is never trusted. Returns None when
+    gmsaas has no auth file.
+    """
+    auth_path = _gmsaas_auth_path()
+    try:
+        mtime = os.stat(auth_path).st_mtime_ns
+    except OSError:
+        return None
+    return f"{_token_fingerprint(token)} {auth_path} {mtime}"
 
 def configure_gmsaas_token(token: str):
-    """Configure the gmsaas CLI with the API token."""
+    """Configure the gmsaas CLI with the API token, unless it is already configured."""
     if not token:
         print("Genymotion API Token not found in environment variables.")
         return
+    state = _auth_state(token)
+    try:
+        with open(_AUTH_MARKER) as f:
+            if state is not None and f.read() == state:
+                print("gmsaas API token already configured.")
+                return
+    except OSError:
+        pass
     try:
         print("Configuring gmsaas API token...")
-        command = ["gmsaas", "auth", "token", token]
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        command = [_GMSAAS_BIN, "auth", "token", token]
+        subprocess.run(command, check=True, capture_output=True)
         print("gmsaas API token configured successfully.")
+        try:
+            state = _auth_state(token)
+            if state is not None:
+                os.makedirs(_CACHE_DIR, exist_ok=True)
+                with open(_AUTH_MARKER, "w") as f:
+                    f.write(state)
+        except OSError:
+            # Not fatal, the token is configured again on next start
+            pass
     except subprocess.CalledProcessError as e:
-        print(f"Error configuring gmsaas API token: {e.stderr if e.stderr else e.stdout}")
+        print(f"Error configuring gmsaas API token: {_error_output(e)}")
         print("Please ensure the token is valid and the gmsaas command is correct.")
     except FileNotFoundError:
         print("Error: gmsaas command not found. Please ensure gmsaas is installed and in your PATH.")
 
+# API token from the environment, a blank value (e.g. from a sloppy .env) counts as missing
+_api_token = (os.environ.get("GENYMOTION_API_TOKEN") or "").strip()
+
 # Configure the gmsaas token before initializing the server or running commands
-configure_gmsaas_token(os.environ.get("GENYMOTION_API_TOKEN"))
+configure_gmsaas_token(_api_token)
 
 # Initialize the MCP server
 mcp = FastMCP("Genymotion SaaS MCP Server")
 
-def run_gmsaas_command(command: List[str]) -> Dict[str, Any]:
-    """Run a gmsaas command and return the results as JSON."""
+# Read-only subcommands whose output only depends on their arguments, mapped
+# to how long (in seconds) a cached result stays valid.
+_READONLY_PREFIXES = {
+    ("recipes", "list"): 30,
+    ("recipes", "get"): 300,
+    ("osimages", "list"): 30,
+    ("instances", "list"): 30,
+    ("instances", "get"): 30,
+}
+
+# Delays (in seconds) between two lookups of an instance ADB serial after adbconnect
+_ADB_SERIAL_POLL_DELAYS = (0.01, 0.02, 0.04, 0.08, 0.16, 0.2, 0.2, 0.2)
+# Time budget (in seconds) of the polling, including the lookups themselves
+_ADB_SERIAL_POLL_TIMEOUT = 1.0
+
+# Cached results of read-only commands: tuple(command) -> (expiry, result),
+# in least recently used order
+_cache: "OrderedDict[Tuple[str, ...], Tuple[float, Any]]" = OrderedDict()
+_CACHE_MAXSIZE = 256
+
+# Read-only subcommands whose cached results are also persisted on disk.
+# Instances are left out: their state changes outside of this server.
+_PERSISTENT_PREFIXES = {("recipes", "list"), ("recipes", "get"), ("osimages", "list")}
+
+# Results are persisted per API token, so a token change never serves the
+# recipes of another account. Without a token the account is unknown and
+# nothing is persisted.
+_disk_cache = None
+if diskcache is not None and _api_token:
+    try:
+        _disk_cache = diskcache.Cache(os.path.join(_CACHE_DIR, "results", _token_fingerprint(_api_token)))
+    except (OSError, sqlite3.Error) as e:
+        # Not fatal, results are only cached in memory
+        print(f"Error opening the results cache: {e}")
+
+# Listings refreshed in the background before their cached result expires,
+# as long as they were requested in the last _REFRESH_IDLE_TIMEOUT seconds
+_REFRESHED_COMMANDS = (["recipes", "list"], ["osimages", "list"])
+_REFRESH_IDLE_TIMEOUT = 600
+# How long (in seconds) before its expiry a cached listing is refreshed
+_REFRESH_MARGIN = 2
+
+# Background task refreshing the listings, started once per process on
+# first access, whatever the number of connected clients
+_refresher: Optional["asyncio.Task[None]"] = None
+
+# Last time each of _REFRESHED_COMMANDS was requested by a client
+_last_access: Dict[Tuple[str, ...], float] = {}
+
+# Locks serializing the lookups of a same read-only command, so concurrent
+# callers and the background refresh do not spawn gmsaas more than once:
+# tuple(command) -> [lock, number of tasks holding or waiting for it]
+_cache_locks: Dict[Tuple[str, ...], List[Any]] = {}
+
+# Bumped whenever cached instance listings are invalidated, so a lookup
+# started before a mutation does not cache the outdated state it fetched
+_instances_generation = 0
+
+_MISSING = object()
+
+def _lru_set(cache: OrderedDict, key: Any, value: Any, maxsize: int):
+    """Store a value in an LRU cache, evicting the least recently used entry when full."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+def _invalidate_instances_cache():
+    """Drop cached instance listings after a command that changes instance state."""
+    global _instances_generation
+    _instances_generation += 1
+    for key in list(_cache):
+        if key[:2] in (("instances", "list"), ("instances", "get")):
+            del _cache[key]
+
+async def _cached_result(key: Tuple[str, ...]) -> Any:
+    """Return the cached result of a read-only command, or _MISSING."""
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _cache.move_to_end(key)
+        return cached[1]
+    if _disk_cache is not None and key[:2] in _PERSISTENT_PREFIXES:
+        # diskcache is a blocking sqlite store, keep it off the event loop
+        result, expire_time = await asyncio.to_thread(_disk_cache.get, key, expire_time=True)
+        if expire_time is not None:
+            # diskcache expiry is wall-clock time, the memory cache uses monotonic time
+            _lru_set(_cache, key, (time.monotonic() + expire_time - time.time(), result), _CACHE_MAXSIZE)
+            return result
+    return _MISSING
+
+async def run_gmsaas_command(command: List[str], refresh: bool = False) -> Dict[str, Any]:
+    """Run a gmsaas command and return the results as JSON.
+
+    Results of read-only commands are cached for a short time, pass
+    `refresh=True` to bypass the cached result and fetch a new one.
+    """
+    key = tuple(command)
+    ttl = _READONLY_PREFIXES.get(key[:2])
+    if ttl is None:
+        return await _execute_gmsaas_command(command)
+
+    if not refresh:
+        if command in _REFRESHED_COMMANDS:
+            _last_access[key] = time.monotonic()
+            _start_refresher()
+        result = await _cached_result(key)
+        if result is not _MISSING:
+            return result
+
+    lock_entry = _cache_locks.setdefault(key, [asyncio.Lock(), 0])
+    lock_entry[1] += 1
+    try:
+        async with lock_entry[0]:
+            # Another caller may have fetched the result while we were waiting
+            result = _MISSING if refresh else await _cached_result(key)
+            if result is _MISSING:
+                generation = _instances_generation
+                result = await _execute_gmsaas_command(command)
+                # Instances changed during the lookup, the result may be outdated
+                if key[0] == "instances" and generation != _instances_generation:
+                    return result
+                _lru_set(_cache, key, (time.monotonic() + ttl, result), _CACHE_MAXSIZE)
+                if _disk_cache is not None and key[:2] in _PERSISTENT_PREFIXES:
+                    await asyncio.to_thread(_disk_cache.set, key, result, expire=ttl)
+            return result
+    finally:
+        # Drop the lock once no task holds or waits for it
+        lock_entry[1] -= 1
+        if not lock_entry[1]:
+            del _cache_locks[key]
+
+def _start_refresher():
+    """Start the background refresh of the hot listings, unless it already runs."""
+    global _refresher
+    if _refresher is None:
+        _refresher = asyncio.create_task(_refresh_listings())
+
+async def _refresh_listings():
+    """Keep the hot listings cached in the background, each one on its own schedule."""
+    await asyncio.gather(*(_refresh_listing(command) for command in _REFRESHED_COMMANDS))
+
+async def _refresh_listing(command: List[str]):
+    """Refresh a listing shortly before each of its cached results expires, so clients keep hitting the cache."""
+    key = tuple(command)
+    # Checking at least this often sees a newly cached result before it is due
+    poll_interval = _READONLY_PREFIXES[key[:2]] - _REFRESH_MARGIN
+    while True:
+        now = time.monotonic()
+        cached = _cache.get(key)
+        last_access = _last_access.get(key)
+        # Skip listings nobody asked for lately, and expired ones: the next
+        # client request fetches them again
+        if (
+            cached is None
+            or cached[0] <= now
+            or last_access is None
+            or now - last_access > _REFRESH_IDLE_TIMEOUT
+        ):
+            await asyncio.sleep(poll_interval)
+            continue
+        refresh_at = cached[0] - _REFRESH_MARGIN
+        if refresh_at > now:
+            # Check again when due, a client may have fetched a newer result meanwhile
+            await asyncio.sleep(refresh_at - now)
+            continue
+        try:
+            await run_gmsaas_command(command, refresh=True)
+        except Exception:
+            # The next client request reports the error, let the result expire
+            await asyncio.sleep(max(cached[0] - time.monotonic(), 0))
+
+async def _communicate(args: List[str]) -> bytes:
+    """Run a process to completion and return its stdout, like subprocess.run(check=True)."""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_GMSAAS_ENV
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, stdout, stderr)
+    return stdout
+
+async def _execute_gmsaas_command(command: List[str]) -> Dict[str, Any]:
+    """Spawn gmsaas and parse its JSON output."""
     try:
-        full_command = ["gmsaas", "--format", "json"] + command
-        env = os.environ.copy()
-        env["GMSAAS_USER_AGENT_EXTRA_DATA"] = "mcp"
-        result = subprocess.run(
-            full_command,
-            capture_output=True,
-            text=True,
-            check=True,
-            env=env
-        )
-        return json.loads(result.stdout)
+        stdout = await _communicate([_GMSAAS_BIN, "--format", "json"] + command)
+        return _json_loads(stdout)
     except subprocess.CalledProcessError as e:
-        error_message = e.stderr if e.stderr else e.stdout
+        error_message = _error_output(e)
         raise Exception(f"Error executing gmsaas command: {error_message}")
-    except json.JSONDecodeError:
+    except _JSONDecodeError:
         raise Exception(f"Error parsing command output as JSON")
 
+# Fields returned by the tools in "json" format
+_RECIPE_FIELDS = ("name", "uuid", "os_version")
+_SEARCH_RESULT_FIELDS = ("name", "uuid", "android_version")
+_INSTANCE_FIELDS = ("name", "uuid", "state")
+_STARTED_INSTANCE_FIELDS = ("uuid", "state", "adb_serial")
+_DEVICE_FIELDS = ("name", "android_version", "screen")
+
+# Output format of the tools: structured "json" content or human readable "text"
+OutputFormat = Literal["json", "text"]
+
+def _select(record: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Keep only the given fields of a gmsaas record, missing ones are None."""
+    return {field: record.get(field) for field in fields}
+
+def _select_all(result: Any, fields: Tuple[str, ...]) -> Any:
+    """Apply _select() to every record of a gmsaas listing."""
+    if not result:
+        return []
+    if isinstance(result, list):
+        return [_select(record, fields) for record in result]
+    # Unexpected structure, return it untouched
+    return result
+
+# Search index of the last recipe list returned by _fetch_recipes():
+# (recipe list, [(lowercased name, lowercased android_version, recipe)])
+_recipe_index: Tuple[Any, List[Tuple[str, str, Dict[str, Any]]]] = (None, [])
+
+async def _fetch_recipes() -> Any:
+    """Return the (cached) output of `gmsaas recipes list`."""
+    return await run_gmsaas_command(["recipes", "list"])
+
+def _recipe_search_index(recipes: List[Dict[str, Any]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Return the case-folded search index of a recipe list, built once per cached list."""
+    global _recipe_index
+    indexed_recipes, index = _recipe_index
+    # A cache hit returns the same list object, so the index can be reused as is
+    if indexed_recipes is not recipes:
+        index = [
+            (recipe.get('name', '').lower(), recipe.get('android_version', '').lower(), recipe)
+            for recipe in recipes
+        ]
+        _recipe_index = (recipes, index)
+    return index
+
+def _format_recipes(result: Any) -> str:
+    """Format the output of `gmsaas recipes list` for display."""
+    if not result:
+        return "No recipes found."
+    
+    parts = ["Available recipes:\n"]
+    
+    # Vérifier si le résultat est une liste ou une chaîne
+    if isinstance(result, list):
+        append = parts.append
+        for recipe in result:
+            append(
+                f"- Name: {recipe.get('name', 'Unknown')}\n"
+                f"  UUID: {recipe.get('uuid', 'Unknown')}\n"
+                f"  OS Version: {recipe.get('os_version', 'Unknown')}\n"
+                "\n"
+            )
+    else:
+        # Si c'est une chaîne, la retourner directement
+        return f"Recipes information: {result}"
+    
+    return "".join(parts)
+
 @mcp.tool()
-def list_recipes() -> str:
-    """List all available Android recipes in Genymotion SaaS."""
+async def list_recipes(format: OutputFormat = "json") -> Union[List[Dict[str, Any]], str]:
+    """
+    List all available Android recipes in Genymotion SaaS.
+    
+    Args:
+        format: "json" for structured results, "text" for a human readable list
+    """
     try:
-        result = run_gmsaas_command(["recipes", "list"])
-        
-        if not result:
-            return "No recipes found."
-        
-        formatted_result = "Available recipes:\n"
-        
-        # Vérifier si le résultat est une liste ou une chaîne
-        if isinstance(result, list):
-            for recipe in result:
-                formatted_result += f"- Name: {recipe.get('name', 'Unknown')}\n"
-                formatted_result += f"  UUID: {recipe.get('uuid', 'Unknown')}\n"
-                formatted_result += f"  OS Version: {recipe.get('os_version', 'Unknown')}\n"
-                formatted_result += "\n"
-        else:
-            # Si c'est une chaîne, la retourner directement
-            return f"Recipes information: {result}"
-        
-        return formatted_result
+        result = await _fetch_recipes()
+        if format == "json":
+            return _select_all(result, _RECIPE_FIELDS)
+        return _format_recipes(result)
     except Exception as e:
+        if format == "json":
+            raise ToolError(f"Error listing recipes: {str(e)}") from e
         return f"Error listing recipes: {str(e)}"
 
+# Rendered text of recently requested recipe details:
+# recipe uuid -> (recipe details, rendered text), in least recently used order
+_rendered_recipe_details: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+_RENDERED_RECIPE_DETAILS_MAXSIZE = 128
+
+async def _fetch_recipe_details(recipe_uuid: str) -> Any:
+    """Return the (cached) output of `gmsaas recipes get`."""
+    return await run_gmsaas_command(["recipes", "get", recipe_uuid])
+
+def _render_recipe_details(recipe_uuid: str, result: Any) -> str:
+    """Render recipe details as indented JSON, reusing the text while the cached details are unchanged."""
+    rendered = _rendered_recipe_details.get(recipe_uuid)
+    # A cache hit returns the same object, so the rendered text is still valid
+    if rendered is not None and rendered[0] is result:
+        _rendered_recipe_details.move_to_end(recipe_uuid)
+        return rendered[1]
+    text = json.dumps(result, indent=2)
+    _lru_set(_rendered_recipe_details, recipe_uuid, (result, text), _RENDERED_RECIPE_DETAILS_MAXSIZE)
+    return text
+
 @mcp.tool()
-def get_recipe_details(recipe_uuid: str) -> str:
-    """Get detailed information about a specific Android recipe."""
+async def get_recipe_details(recipe_uuid: str, format: OutputFormat = "json") -> Union[Dict[str, Any], str]:
+    """
+    Get detailed information about a specific Android recipe.
+    
+    Args:
+        recipe_uuid: UUID of the recipe
+        format: "json" for structured results, "text" for indented JSON text
+    """
     try:
-        result = run_gmsaas_command(["recipes", "get", recipe_uuid])
-        return json.dumps(result, indent=2)
+        result = await _fetch_recipe_details(recipe_uuid)
+        if format == "json":
+            return result
+        return _render_recipe_details(recipe_uuid, result)
     except Exception as e:
+        if format == "json":
+            raise ToolError(f"Error getting recipe details: {str(e)}") from e
         return f"Error getting recipe details: {str(e)}"
 
 @mcp.tool()
-def list_running_instances() -> str:
-    """List all running Android instances in Genymotion SaaS."""
+async def list_running_instances(format: OutputFormat = "json") -> Union[List[Dict[str, Any]], str]:
+    """
+    List all running Android instances in Genymotion SaaS.
+    
+    Args:
+        format: "json" for structured results, "text" for a human readable list
+    """
     try:
-        result = run_gmsaas_command(["instances", "list"])
+        result = await run_gmsaas_command(["instances", "list"])
+        
+        if format == "json":
+            return _select_all(result, _INSTANCE_FIELDS)
         
         if not result:
             return "No running instances found."
         
-        formatted_result = "Running instances:\n"
+        parts = ["Running instances:\n"]
         
         # Vérifier si le résultat est une liste ou une chaîne
         if isinstance(result, list):
+            append = parts.append
             for instance in result:
-                formatted_result += f"- Name: {instance.get('name', 'Unknown')}\n"
-                formatted_result += f"  UUID: {instance.get('uuid', 'Unknown')}\n"
-                formatted_result += f"  State: {instance.get('state', 'Unknown')}\n"
-                formatted_result += "\n"
+                append(
+                    f"- Name: {instance.get('name', 'Unknown')}\n"
+                    f"  UUID: {instance.get('uuid', 'Unknown')}\n"
+                    f"  State: {instance.get('state', 'Unknown')}\n"
+                    "\n"
+                )
         else:
             # Si c'est une chaîne, la retourner directement
             return f"Instances information: {result}"
         
-        return formatted_result
+        return "".join(parts)
     except Exception as e:
+        if format == "json":
+            raise ToolError(f"Error listing instances: {str(e)}") from e
         return f"Error listing instances: {str(e)}"
 
 
 @mcp.tool()
-def start_instance(recipe_uuid: str, instance_name: str) -> str:
+async def start_instance(
+    recipe_uuid: str, instance_name: str, format: OutputFormat = "json"
+) -> Union[Dict[str, Any], str]:
     """
     Start an Android instance from a recipe.
     
     Args:
         recipe_uuid: UUID of the recipe to use
         instance_name: Name to give to the new instance
+        format: "json" for structured results, "text" for a human readable summary
     """
     try:
         command = ["instances", "start", recipe_uuid, instance_name]
         
-        json_result = run_gmsaas_command(command)
+        json_result = await run_gmsaas_command(command)
+        _invalidate_instances_cache()
         
         # Extraire les données de l'instance
         if "instance" in json_result:
@@ -137,36 +505,49 @@ def start_instance(recipe_uuid: str, instance_name: str) -> str:
         else:
             result = json_result  # Fallback au cas où la structure serait différente
         
+        if format == "json":
+            instance = {"name": instance_name, **_select(result, _STARTED_INSTANCE_FIELDS)}
+            if "recipe" in result:
+                instance["recipe"] = _select(result["recipe"], _DEVICE_FIELDS)
+            return instance
+        
         # Format the response
-        formatted_result = f"Instance '{instance_name}' started successfully!\n"
-        formatted_result += f"UUID: {result.get('uuid', 'Unknown')}\n"
-        formatted_result += f"State: {result.get('state', 'Unknown')}\n"
-        formatted_result += f"ADB Serial: {result.get('adb_serial', 'Unknown')}\n"
+        parts = [
+            f"Instance '{instance_name}' started successfully!\n"
+            f"UUID: {result.get('uuid', 'Unknown')}\n"
+            f"State: {result.get('state', 'Unknown')}\n"
+            f"ADB Serial: {result.get('adb_serial', 'Unknown')}\n"
+        ]
         
         # Include recipe details if available
         if "recipe" in result:
             recipe = result["recipe"]
-            formatted_result += f"\nDevice Details:\n"
-            formatted_result += f"- Name: {recipe.get('name', 'Unknown')}\n"
-            formatted_result += f"- Android Version: {recipe.get('android_version', 'Unknown')}\n"
-            formatted_result += f"- Screen: {recipe.get('screen', 'Unknown')}\n"
+            parts.append(
+                "\nDevice Details:\n"
+                f"- Name: {recipe.get('name', 'Unknown')}\n"
+                f"- Android Version: {recipe.get('android_version', 'Unknown')}\n"
+                f"- Screen: {recipe.get('screen', 'Unknown')}\n"
+            )
         
         
-        return formatted_result
+        return "".join(parts)
     except Exception as e:
+        if format == "json":
+            raise ToolError(f"Error starting instance: {str(e)}") from e
         return f"Error starting instance: {str(e)}"
 
 @mcp.tool()
-def stop_instance(instance_uuid: str) -> str:
+async def stop_instance(instance_uuid: str) -> str:
     """Stop a running Android instance."""
     try:
-        run_gmsaas_command(["instances", "stop", instance_uuid])
+        await run_gmsaas_command(["instances", "stop", instance_uuid])
+        _invalidate_instances_cache()
         return f"Instance {instance_uuid} stopped successfully."
     except Exception as e:
         return f"Error stopping instance: {str(e)}"
 
 @mcp.tool()
-def connect_adb(instance_uuid: str, adb_port: Optional[int] = None) -> str:
+async def connect_adb(instance_uuid: str, adb_port: Optional[int] = None) -> str:
     """
     Connect ADB to a running Android instance.
     
@@ -179,19 +560,30 @@ def connect_adb(instance_uuid: str, adb_port: Optional[int] = None) -> str:
         if adb_port is not None:
             command.extend(["--adb-serial-port", str(adb_port)])
             
-        result = run_gmsaas_command(command)
-        time.sleep(0.5)
+        result = await run_gmsaas_command(command)
+        _invalidate_instances_cache()
         # Update to access the nested adb_serial
         adb_serial_value = result.get('instance', {}).get('adb_serial', 'Unknown')
 
         # If adb_serial is still unknown, get the instance details to get the correct value
         if adb_serial_value == 'Unknown':
             print("ADB serial unknown, getting instance details to get updated value...")
-            # Use 'instances get' instead of 'instances list'
-            instance_details_result = run_gmsaas_command(["instances", "get", instance_uuid])
             try:
-                # The structure is different for 'get' command, the instance details are directly at the top level
-                adb_serial_value = instance_details_result.get('adb_serial', 'Unknown')
+                # Poll with an increasing delay until the serial is reported or
+                # the time budget is spent
+                deadline = time.monotonic() + _ADB_SERIAL_POLL_TIMEOUT
+                for delay in _ADB_SERIAL_POLL_DELAYS:
+                    if time.monotonic() + delay > deadline:
+                        break
+                    await asyncio.sleep(delay)
+                    # Use 'instances get' instead of 'instances list'
+                    instance_details_result = await run_gmsaas_command(
+                        ["instances", "get", instance_uuid], refresh=True
+                    )
+                    # The structure is different for 'get' command, the instance details are directly at the top level
+                    adb_serial_value = instance_details_result.get('adb_serial', 'Unknown')
+                    if adb_serial_value and adb_serial_value != 'Unknown':
+                        break
                 print(f"Found updated ADB serial: {adb_serial_value}")
             except Exception as e:
                 print(f"Error parsing instance details result: {e}")
@@ -201,71 +593,84 @@ def connect_adb(instance_uuid: str, adb_port: Optional[int] = None) -> str:
         return f"Error connecting ADB: {str(e)}"
 
 @mcp.tool()
-def disconnect_adb(instance_uuid: str) -> str:
+async def disconnect_adb(instance_uuid: str) -> str:
     """Disconnect ADB from a running Android instance."""
     try:
-        run_gmsaas_command(["instances", "adbdisconnect", instance_uuid])
+        await run_gmsaas_command(["instances", "adbdisconnect", instance_uuid])
+        _invalidate_instances_cache()
         return f"ADB disconnected from {instance_uuid}."
     except Exception as e:
         return f"Error disconnecting ADB: {str(e)}"
 
 
 @mcp.resource("genymotion://os-versions")
-def get_available_os_versions() -> str:
+async def get_available_os_versions() -> str:
     """Get list of available Android OS versions."""
     try:
-        result = run_gmsaas_command(["osimages", "list"])
+        result = await run_gmsaas_command(["osimages", "list"])
         
         if not result:
             return "No Android OS versions found."
         
-        formatted_result = "Available Android OS versions:\n"
+        parts = ["Available Android OS versions:\n"]
+        append = parts.append
         for image in result:
-            formatted_result += f"- {image.get('os_version', 'Unknown')}\n"
+            append(f"- {image.get('os_version', 'Unknown')}\n")
         
-        return formatted_result
+        return "".join(parts)
     except Exception as e:
         return f"Error listing OS versions: {str(e)}"
 
 @mcp.tool()
-def search_recipes(recipe_name: str) -> str:
+async def search_recipes(
+    recipe_name: str, format: OutputFormat = "json"
+) -> Union[List[Dict[str, Any]], str]:
     """
     Search for recipes matching a given name and list them for selection.
     
     Args:
         recipe_name: The name or part of the name to search for
+        format: "json" for the structured matching recipes, "text" for a human readable list
     """
     try:
-        result = run_gmsaas_command(["recipes", "list"])
+        result = await _fetch_recipes()
         
         if not result:
-            return "No recipes found."
+            return [] if format == "json" else "No recipes found."
         
         # Filtrer les recipes qui correspondent au nom recherché ou à l'android_version
         matching_recipes = []
         if isinstance(result, list):
-            for recipe in result:
-                # Vérifie si le terme recherché est dans le nom ou dans android_version
-                if (recipe_name.lower() in recipe.get('name', '').lower() or 
-                    recipe_name.lower() in recipe.get('android_version', '').lower()):
-                    matching_recipes.append(recipe)
+            needle = recipe_name.lower()
+            # Vérifie si le terme recherché est dans le nom ou dans android_version
+            matching_recipes = [
+                recipe for name, android_version, recipe in _recipe_search_index(result)
+                if needle in name or needle in android_version
+            ]
 
+        if format == "json":
+            return _select_all(matching_recipes, _SEARCH_RESULT_FIELDS)
         
         if not matching_recipes:
-            return f"No recipes found matching '{recipe_name}'. Here are all available recipes:\n\n{list_recipes()}"
+            return f"No recipes found matching '{recipe_name}'. Here are all available recipes:\n\n{_format_recipes(result)}"
         
-        formatted_result = f"Found {len(matching_recipes)} recipes matching '{recipe_name}':\n\n"
+        parts = [f"Found {len(matching_recipes)} recipes matching '{recipe_name}':\n\n"]
+        append = parts.append
         
         for i, recipe in enumerate(matching_recipes, 1):
-            formatted_result += f"{i}. Name: {recipe.get('name', 'Unknown')}\n"
-            formatted_result += f"   UUID: {recipe.get('uuid', 'Unknown')}\n"
-            formatted_result += f"   OS Version: {recipe.get('android_version', 'Unknown')}\n"
-            formatted_result += "\n"
+            append(
+                f"{i}. Name: {recipe.get('name', 'Unknown')}\n"
+                f"   UUID: {recipe.get('uuid', 'Unknown')}\n"
+                f"   OS Version: {recipe.get('android_version', 'Unknown')}\n"
+                "\n"
+            )
         
-        formatted_result += "Please choose a recipe by providing its UUID for starting your instance."
+        append("Please choose a recipe by providing its UUID for starting your instance.")
         
-        return formatted_result
+        return "".join(parts)
     except Exception as e:
+        if format == "json":
+            raise ToolError(f"Error searching recipes: {str(e)}") from e
         return f"Error searching recipes: {str(e)}"
 
 def main():